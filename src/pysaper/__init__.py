@@ -1,5 +1,6 @@
 __all__ = [
     'saper',
     'game',
-    'records'
+    'records',
+    'bot'
 ]
@@ -1,14 +1,33 @@
 #!/usr/bin/env python
 """Game entry point module"""
+import argparse
+import os
 import sys
 
 from PyQt6.QtWidgets import QApplication
 
 from window import MainWindow
+import bot
 
 def main() -> int:
-    app = QApplication(sys.argv)
+    parser = argparse.ArgumentParser(description='Saper aka Minesweeper game')
+    parser.add_argument('--bot', action='store_true',
+                        help='play headless, reading requests from stdin and writing responses to stdout')
+    parser.add_argument('--listen', metavar='NAME',
+                        help='accept requests on local socket NAME while playing in the window')
+    args, qt_args = parser.parse_known_args()
+    if args.bot :
+        os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+        app = QApplication(sys.argv[:1] + qt_args)
+        bot.serve(sys.stdin, sys.stdout, bot.Session())
+        return 0
+    app = QApplication(sys.argv[:1] + qt_args)
     window = MainWindow()
+    if args.listen :
+        try:
+            bot.Server(args.listen, bot.Session(window), window)
+        except OSError as error:
+            parser.error(f'cannot listen on {args.listen}: {error}')
     return app.exec()
 
 if __name__ == '__main__':
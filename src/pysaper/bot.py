@@ -0,0 +1,205 @@
+"""Protocol for driving the game programmatically
+
+Every request and response is a single line of JSON.
+Requests:
+    {"cmd": "new", "mode": "e", "seed": 7}
+    {"cmd": "new", "rows": 20, "cols": 40, "bombs": 150, "seed": 7}
+    {"cmd": "move", "moves": [["u", 3, 4], ["f", 0, 0], ["c", 3, 4]]}
+Moves are "u" - uncover, "f" - toggle mark (as right-click does), "c" - chord
+(uncover neighbors when adjacent bombs are flagged). A batch with any malformed
+move is rejected before the board is touched. Responses carry game state
+and only fields changed by the request as [row, col, value] triplets, where
+value is a number 0-8, 9 for a mine, or one of COVERED, FLAG, QMARK.
+Mines are placed on the first uncover away from uncovered field, so the same
+seed and the same first move give the same board. Games the bot moved in are not
+saved to records, even inside the window.
+"""
+
+import json
+
+from PyQt6.QtCore import QObject, pyqtSlot as Slot
+from PyQt6.QtNetwork import QAbstractSocket, QLocalServer, QLocalSocket
+
+import game
+
+MODES = {'b': (8, 8, 10), 'a': (16, 16, 40), 'e': (16, 30, 99)}
+COVERED = -1
+FLAG = 10
+QMARK = 11
+#same limit as two digits allowed in custom setup dialog
+MAX_SIZE = 99
+
+class Session(QObject):
+    """Executes requests on a board, headless or inside a running MainWindow"""
+
+    def __init__(self, window=None) -> None:
+        super().__init__()
+        self.window = window
+        self.board = None
+        self.state = 'idle'
+        self.changed = {}
+
+    def attach(self, board) -> None:
+        """Start tracking fields of given board"""
+        self.board = board
+        self.state = board.state
+        self.changed = {}
+        board.lost.connect(self.handle_failure)
+        board.won.connect(self.handle_victory)
+        for button in board.fields.values():
+            button.toggled.connect(self.track)
+            button.right.connect(self.track)
+
+    @Slot(bool)
+    @Slot(tuple)
+    def track(self, *args) -> None:
+        """Remember field changed by current request
+        (decorated slot is connected without per-button proxy objects)"""
+        self.changed[self.sender().property('field')] = None
+
+    def handle_failure(self) -> None:
+        """Stop accepting moves after a mine was hit"""
+        self.state = 'lost'
+
+    def handle_victory(self) -> None:
+        """Stop accepting moves after the board is cleared"""
+        self.state = 'won'
+
+    def value(self, field: tuple) -> int:
+        """Returns what player can see on the field"""
+        button = self.board.fields[field]
+        if button.isChecked():
+            return button.property('number')
+        return (COVERED, FLAG, QMARK)[button.property('flagged')]
+
+    def new_game(self, mode: str, rows: int, cols: int, bombcount: int, seed=None) -> None:
+        """Start a new game on its own board or in the window"""
+        if self.window is None:
+            self.attach(game.Board(rows, cols, bombcount, seed=seed))
+            return
+        window = self.window
+        #window is changed only when the board was built
+        board = game.Board(rows, cols, bombcount, question=window.property('question'), seed=seed)
+        for key, action in zip('baec', (window.beginner, window.advanced, window.expert, window.custom)):
+            action.setChecked(key == mode)
+        window.rows, window.cols, window.bombcount = rows, cols, bombcount
+        window.setProperty('mode', mode)
+        window.play(board)
+        self.attach(board)
+
+    def check(self, moves: list) -> None:
+        """Raise ValueError if any move is malformed, before any is applied"""
+        if not isinstance(moves, list):
+            raise ValueError('Moves must be a list')
+        for move in moves:
+            if not isinstance(move, list) or len(move) != 3:
+                raise ValueError(f'Move must be [kind, row, col], got {move!r}')
+            kind, row, col = move
+            if kind not in ('u', 'f', 'c'):
+                raise ValueError(f'Unknown move {kind!r}')
+            if type(row) is not int or type(col) is not int or (row, col) not in self.board.fields:
+                raise ValueError(f'No field {[row, col]}')
+
+    def move(self, moves: list) -> None:
+        """Apply moves in order, stop when game is over"""
+        for kind, row, col in moves:
+            field = (row, col)
+            if self.state != 'playing':
+                break
+            if self.window is not None:
+                #games played by bot don't go to records
+                self.board.setProperty('bot', True)
+                if not self.window.timerID:
+                    self.window.timerID = self.window.startTimer(1000)
+            match kind:
+                case 'u':
+                    self.board.uncover(field)
+                case 'f':
+                    self.board.fields[field].mark()
+                case 'c':
+                    self.board.mass_uncover_safe(field)
+
+    def handle(self, line: str | bytes) -> str:
+        """Execute one request and return response line"""
+        try:
+            request = json.loads(line)
+            #follow the game if player started a new one in the window
+            if self.window is not None and self.window.playground is not self.board:
+                self.attach(self.window.playground)
+            match request.get('cmd'):
+                case 'new':
+                    mode = request.get('mode', 'c')
+                    if mode in MODES:
+                        rows, cols, bombcount = MODES[mode]
+                    else:
+                        mode = 'c'
+                        rows, cols, bombcount = request['rows'], request['cols'], request['bombs']
+                        if any(type(value) is not int for value in (rows, cols, bombcount)):
+                            raise ValueError('Rows, cols and bombs must be integers')
+                        if rows < 1 or cols < 1:
+                            raise ValueError('Board must have at least one row and column')
+                        if rows > MAX_SIZE or cols > MAX_SIZE:
+                            raise ValueError(f'Board can have at most {MAX_SIZE} rows and columns')
+                        if not 0 <= bombcount < rows * cols:
+                            raise ValueError('Too many bombs for given board dimensions')
+                    self.new_game(mode, rows, cols, bombcount, request.get('seed'))
+                    response = {'state': self.state, 'rows': rows, 'cols': cols, 'bombs': bombcount}
+                case 'move':
+                    if self.board is None:
+                        raise ValueError('No game started')
+                    self.changed = {}
+                    self.check(request['moves'])
+                    self.move(request['moves'])
+                    cells = [[*field, self.value(field)] for field in self.changed]
+                    response = {'state': self.state, 'cells': cells}
+                case cmd:
+                    raise ValueError(f'Unknown command {cmd!r}')
+        except (ValueError, KeyError, TypeError, AttributeError) as error:
+            response = {'error': str(error)}
+        return json.dumps(response, separators=(',', ':')) + '\n'
+
+
+def serve(infile, outfile, session: Session) -> None:
+    """Answer requests read line by line (e.g. from stdin) until end of input"""
+    for line in infile:
+        if line.strip():
+            outfile.write(session.handle(line))
+            outfile.flush()
+
+
+class Server(QLocalServer):
+    """Local socket server handling requests within Qt event loop"""
+
+    def __init__(self, name: str, session: Session, parent=None) -> None:
+        super().__init__(parent)
+        self.session = session
+        self.newConnection.connect(self.handle_connection)
+        if not self.listen(name):
+            #socket left by a crashed instance may be removed, a live one may not
+            if self.serverError() != QAbstractSocket.SocketError.AddressInUseError:
+                raise OSError(self.errorString())
+            probe = QLocalSocket()
+            probe.connectToServer(name)
+            if probe.waitForConnected(1000):
+                probe.disconnectFromServer()
+                raise OSError(f'another instance is already serving {name}')
+            QLocalServer.removeServer(name)
+            if not self.listen(name):
+                raise OSError(self.errorString())
+
+    @Slot()
+    def handle_connection(self) -> None:
+        """Read requests from every new client"""
+        socket = self.nextPendingConnection()
+        socket.readyRead.connect(self.handle_requests)
+        socket.disconnected.connect(socket.deleteLater)
+
+    @Slot()
+    def handle_requests(self) -> None:
+        """Answer every complete line received"""
+        socket = self.sender()
+        while socket.canReadLine():
+            line = bytes(socket.readLine())
+            if line.strip():
+                socket.write(self.session.handle(line).encode())
+        socket.flush()
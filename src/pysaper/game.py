@@ -20,27 +20,20 @@ class CoverButton(QPushButton):
         self.setCheckable(True)
         self.setProperty('field', field)
         self.setProperty('flagged', 0)
-        self.setStyleSheet('''
-                           * { font-weight: bold; }
-                           *[number="1"] { color: blue; }
-                           *[number="2"] { color: green; }
-                           *[number="3"] { color: red; }
-                           *[number="4"] { color: sienna; }
-                           *[number="5"] { color: purple; }
-                           *[number="6"] { color: goldenrod; }
-                           *[number="7"] { color: black; }
-                           *[number="8"] { color: magenta; }                           
-                           ''')
+
+    def mark(self) -> None:
+        """Toggle flag on covered field and emit it's position"""
+        if not self.isChecked() :
+            if self.property('flagged'):
+                self.setProperty('flagged', 0)
+            else:
+                self.setProperty('flagged', 1)
+            self.right.emit(self.property('field'))
 
     def mousePressEvent(self, event) -> None:
         """Change icon when right-click, send signal when left-click"""
         if event.button() == Qt.MouseButton.RightButton :
-            if not self.isChecked() :
-                if self.property('flagged'):
-                    self.setProperty('flagged', 0)
-                else:
-                    self.setProperty('flagged', 1)
-                self.right.emit(self.property('field'))
+            self.mark()
         elif event.button() == Qt.MouseButton.LeftButton :
             self.pressed.emit(self.property('field'))
 
@@ -62,19 +55,17 @@ class CoverButton(QPushButton):
 
 class CoverButtonQuestion(CoverButton):
     """Theese modified buttons can be marked with question mark"""
-    def mousePressEvent(self, event):
-        if event.button() == Qt.MouseButton.RightButton :
-            if not self.isChecked() :
-                match self.property('flagged'):
-                    case 0:
-                        self.setProperty('flagged', 1)
-                    case 1:
-                        self.setProperty('flagged', 2)
-                    case 2:
-                        self.setProperty('flagged', 0)
-                self.right.emit(self.property('field'))
-        else :
-            super().mousePressEvent(event)
+    def mark(self) -> None:
+        """Cycle flag, question mark and no mark on covered field"""
+        if not self.isChecked() :
+            match self.property('flagged'):
+                case 0:
+                    self.setProperty('flagged', 1)
+                case 1:
+                    self.setProperty('flagged', 2)
+                case 2:
+                    self.setProperty('flagged', 0)
+            self.right.emit(self.property('field'))
 
 
 class Board(QWidget):
@@ -82,8 +73,22 @@ class Board(QWidget):
     lost = Signal()
     won = Signal()
 
-    def __init__(self, rows, cols, bombcount, question=False) -> None:
+    def __init__(self, rows, cols, bombcount, question=False, seed=None) -> None:
         super().__init__()
+        #one stylesheet for all buttons is much cheaper than a stylesheet per button
+        self.setStyleSheet('''
+                           QPushButton { font-weight: bold; }
+                           QPushButton[number="1"] { color: blue; }
+                           QPushButton[number="2"] { color: green; }
+                           QPushButton[number="3"] { color: red; }
+                           QPushButton[number="4"] { color: sienna; }
+                           QPushButton[number="5"] { color: purple; }
+                           QPushButton[number="6"] { color: goldenrod; }
+                           QPushButton[number="7"] { color: black; }
+                           QPushButton[number="8"] { color: magenta; }
+                           ''')
+        #same seed gives the same board
+        self.random = random.Random(seed)
         #icons
         self.noicon = QIcon()
         self.flag = QIcon('./resources/flag.png')
@@ -95,20 +100,27 @@ class Board(QWidget):
         #counters
         self.bombcount = bombcount
         self.wincounter = rows * cols
+        #'playing' until failure or victory sets 'lost' or 'won'
+        self.state = 'playing'
         #make gameboard, layout and fill with covering buttons
         self.fields = {(i,j) : CoverButtonQuestion((i,j)) if question else CoverButton((i,j)) for i in range(rows) for j in range(cols)}
-        self.populate()
+        #mines are placed when first field is uncovered
+        self.bombs = None
         layout = QGridLayout()
         layout.setSpacing(0)
         for field in self.fields:
             layout.addWidget(self.fields[field], *field)
         self.setLayout(layout)
 
-    def populate(self) -> None:
-        """Fills board with numbers (9 stands for mine)"""
-        self.bombs = random.sample(sorted(self.fields), self.bombcount)
-        self.empty = []
-        self.numbers = []
+    def populate(self, first: tuple) -> None:
+        """Fills board with numbers (9 stands for mine),
+        mines are kept away from first uncovered field and if possible it's neighbors"""
+        safe = {first, *self.neighborhood(first)}
+        if len(self.fields) - len(safe) < self.bombcount:
+            safe = {first}
+        self.bombs = set(self.random.sample(sorted(self.fields.keys() - safe), self.bombcount))
+        self.empty = set()
+        self.numbers = set()
         for field in self.bombs:
             self.fields[field].setProperty('number', 9)
         for field in self.fields:
@@ -119,10 +131,36 @@ class Board(QWidget):
                 if f in self.bombs:
                     counter += 1
             if counter == 0:
-                self.empty.append(field)
+                self.empty.add(field)
             else:
-                self.numbers.append(field)
+                self.numbers.add(field)
             self.fields[field].setProperty('number', counter)
+        self.bbbv = self.count_clicks()
+
+    def count_clicks(self) -> int:
+        """Returns 3BV - minimal number of clicks needed to clear the board.
+        Each opening (empty fields joined with union-find) takes one click,
+        so does each number that is not on the border of an opening"""
+        parent = {field: field for field in self.empty}
+        def find(field):
+            while parent[field] != field:
+                parent[field] = parent[parent[field]]
+                field = parent[field]
+            return field
+        border = set()
+        for field in self.empty:
+            i, j = field
+            #join with empty neighbors above and on the left, each pair meets once
+            for f in ((i-1, j-1), (i-1, j), (i-1, j+1), (i, j-1)):
+                if f in parent:
+                    root, other = find(field), find(f)
+                    if root != other:
+                        parent[root] = other
+            for f in ((i-1, j-1), (i-1, j), (i-1, j+1), (i, j-1), (i, j+1), (i+1, j-1), (i+1, j), (i+1, j+1)):
+                if f in self.numbers:
+                    border.add(f)
+        openings = sum(1 for field in parent if parent[field] == field)
+        return openings + len(self.numbers) - len(border)
 
     def neighborhood(self, field: tuple) -> list:
         """Returns neighbor fields to the given one"""
@@ -158,14 +196,19 @@ class Board(QWidget):
 
     def uncover(self, field) -> bool:
         """Method reveals content of the field(s)"""
-        if self.fields[field].isChecked() :
+        if self.fields[field].isChecked() or self.state != 'playing' :
             return False
+        if self.bombs is None :
+            self.populate(field)
         self.fields[field].setIcon(self.noicon)
         self.fields[field].setProperty('flagged', 0)
         self.fields[field].setChecked(True)
         #uncover a number
         if field in self.numbers :
             self.fields[field].setText( str(self.fields[field].property('number')) )
+            #number was set after button got styled, apply it's color
+            self.fields[field].style().unpolish(self.fields[field])
+            self.fields[field].style().polish(self.fields[field])
         #loose when you click a bomb
         elif field in self.bombs :
             self.failure()
@@ -196,6 +239,7 @@ class Board(QWidget):
 
     def failure(self) -> None:
         """Show bombs, deactivate fields, and send lost signal"""
+        self.state = 'lost'
         for field in self.bombs :
             self.fields[field].setIcon(self.mine)
             self.fields[field].setChecked(True)
@@ -208,6 +252,7 @@ class Board(QWidget):
         """Decrease counter, check condition, deactivate bomb-fields and send win signal"""
         self.wincounter -= 1
         if self.wincounter == self.bombcount :
+            self.state = 'won'
             for field in self.bombs:
                 self.fields[field].setIcon(self.flag)
             for field in self.fields :
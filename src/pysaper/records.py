@@ -1,15 +1,19 @@
 #!/usr/bin/env python
 """Module for handling records in csv database"""
 
+import bisect
 import csv
+import io
+import os
 import time
 
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QLockFile
 from PyQt6.QtWidgets import (QDialog, QDialogButtonBox, QLabel,
                              QGridLayout, QMessageBox, QInputDialog)
 
 RECORDS_PATH = './records.csv'
-FIELDNAMES = ['mode', 'date', 'name', 'time']
+FIELDNAMES = ['mode', 'date', 'name', 'time', '3bv', '3bv/s']
+HEADERS = ['Date', 'Name', 'Time', '3BV', '3BV/s']
 
 def convert_seconds(seconds: int | str) -> str:
     """Present seconds in human readable format"""
@@ -34,26 +38,65 @@ class Model:
         return cls.instance
 
     def __init__(self, path: str=RECORDS_PATH) -> None:
-        """Initialize data and sort it"""
+        """Initialize data once, afterwards only catch up with the file"""
+        if getattr(self, 'path', None) == path:
+            self.refresh()
+            return
         self.path = path
+        self.reset()
+        self.refresh()
+
+    def reset(self) -> None:
+        """Forget everything read from file"""
         self.data = {'b': [], 'a': [], 'e': []}
+        self.header = FIELDNAMES
+        self.no_file = True
+        self.offset = 0
+        self.stamp = None
+
+    def refresh(self) -> None:
+        """Detect changes by file size and modification time,
+        read appended bytes only, reload whole file if it was rewritten or replaced"""
         try:
-            self.load()
+            stat = os.stat(self.path)
         except FileNotFoundError:
-            self.no_file = True
-            self.header = FIELDNAMES
-        else:
-            self.no_file = False
-            self.sort()
+            if not self.no_file:
+                self.reset()
+            return
+        stamp = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        if stamp == self.stamp:
+            return
+        if stat.st_size <= self.offset or self.stamp and stat.st_ino != self.stamp[0]:
+            self.reset()
+        self.stamp = stamp
+        self.load()
 
     def load(self) -> None:
-        """Reads records from file"""
-        with open(self.path, 'r', newline='', encoding='utf-8') as records :
-            reader = csv.DictReader(records, dialect='unix')
+        """Reads records appended to file since last load"""
+        with open(self.path, 'rb') as records :
+            records.seek(self.offset)
+            chunk = records.read()
+        #leave incomplete line until it's finished
+        end = chunk.rfind(b'\n') + 1
+        text = io.StringIO(chunk[:end].decode('utf-8'), newline='')
+        reader = csv.DictReader(text, fieldnames=None if self.no_file else self.header, dialect='unix')
+        if self.no_file:
+            #header is not written yet
+            if reader.fieldnames is None:
+                return
             self.header = reader.fieldnames
-            for row in reader:
-                row['time'] = int(row['time'])
-                self.data[row.pop('mode')].append(row)
+        whole = self.no_file
+        self.no_file = False
+        self.offset += end
+        for row in reader:
+            row['time'] = int(row['time'])
+            value = self.data.setdefault(row.pop('mode'), [])
+            if whole:
+                value.append(row)
+            else:
+                bisect.insort(value, row, key=lambda item: item['time'])
+        if whole:
+            self.sort()
 
     def sort(self) -> None:
         """Sort data by best times"""
@@ -67,15 +110,38 @@ class Model:
                 return False
         return True
 
-    def add(self, mode: str, name: str, seconds: int) -> None:
-        """Add record, sort and synchronize with file"""
-        self.data[mode].append({'date': time.strftime('%x'), 'name': name, 'time': seconds})
-        self.sort()
-        with open(self.path, 'a', newline='', encoding='utf-8') as records :
-            writer = csv.DictWriter(records, fieldnames=self.header, dialect='unix')
-            if self.no_file:
-                writer.writeheader()
-            writer.writerow({'mode': mode, 'date': time.strftime('%x'), 'name': name, 'time': seconds})
+    def add(self, mode: str, name: str, seconds: int, bbbv: int) -> None:
+        """Append record holding a lock shared by game instances,
+        then read it back together with records added by others"""
+        lock = QLockFile(self.path + '.lock')
+        lock.lock()
+        try:
+            self.refresh()
+            if not self.no_file and self.header != FIELDNAMES:
+                self.upgrade()
+            with open(self.path, 'a', newline='', encoding='utf-8') as records :
+                writer = csv.DictWriter(records, fieldnames=FIELDNAMES, dialect='unix')
+                if self.no_file:
+                    writer.writeheader()
+                writer.writerow({'mode': mode, 'date': time.strftime('%x'), 'name': name, 'time': seconds,
+                                 '3bv': bbbv, '3bv/s': f'{bbbv / max(seconds, 1):.2f}'})
+            self.refresh()
+        finally:
+            lock.unlock()
+
+    def upgrade(self) -> None:
+        """Rewrite file made by older version with current columns,
+        rows are copied in their original order with 3BV left empty,
+        replacing the file lets other instances notice and reload it"""
+        temp = self.path + '.tmp'
+        with open(self.path, 'r', newline='', encoding='utf-8') as old, \
+             open(temp, 'w', newline='', encoding='utf-8') as records :
+            writer = csv.DictWriter(records, fieldnames=FIELDNAMES, restval='', dialect='unix')
+            writer.writeheader()
+            writer.writerows(csv.DictReader(old, dialect='unix'))
+        os.replace(temp, self.path)
+        self.reset()
+        self.refresh()
 
     def __len__(self) -> int:
         """Return how many rows are present"""
@@ -84,19 +150,22 @@ class Model:
     def item(self, row: int, col: int) -> str:
         """Returns item at given index for presenting data in tabular form"""
         if col < 0: raise IndexError
-        elif col < 3: mode = 'b'
-        elif col < 6: mode = 'a'
-        elif col < 9: mode = 'e'
+        elif col < 5: mode = 'b'
+        elif col < 10: mode = 'a'
+        elif col < 15: mode = 'e'
         else: raise IndexError
         wrapper = lambda x: x
-        match col % 3:
+        match col % 5:
             case 0: field = 'date'
             case 1: field = 'name'
             case 2:
                 field = 'time'
                 wrapper = convert_seconds
+            case 3: field = '3bv'
+            case 4: field = '3bv/s'
         try:
-            return wrapper(self.data[mode][row][field])
+            #records saved by older versions have no 3BV
+            return wrapper(self.data[mode][row].get(field, ''))
         except IndexError:
             return ''
 
@@ -113,15 +182,15 @@ class View(QDialog):
         #layout
         layout = QGridLayout()
         layout.setHorizontalSpacing(20)
-        layout.addWidget(QLabel('Beginner'), 0, 0, 1, 3)
-        layout.addWidget(QLabel('Advanced'), 0, 3, 1, 3)
-        layout.addWidget(QLabel('Expert'), 0, 6, 1, 3)
-        for i in range(0, 9):
-            layout.addWidget(QLabel(model.header[1:][i % 3].capitalize()), 1, i)
+        layout.addWidget(QLabel('Beginner'), 0, 0, 1, 5)
+        layout.addWidget(QLabel('Advanced'), 0, 5, 1, 5)
+        layout.addWidget(QLabel('Expert'), 0, 10, 1, 5)
+        for i in range(0, 15):
+            layout.addWidget(QLabel(HEADERS[i % 5]), 1, i)
         for row in range(len(model)):
-            for col in range(9):
+            for col in range(15):
                 layout.addWidget(QLabel(model.item(row, col)), row + 2, col)
-        layout.addWidget(button, len(model) + 2, 0, 1, 9, Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(button, len(model) + 2, 0, 1, 15, Qt.AlignmentFlag.AlignCenter)
         self.setLayout(layout)
 
 def show(parent=None) -> None:
@@ -147,7 +216,7 @@ def end_game(parent) -> None:
     if model.check_record(mode, seconds):
         name, ok = QInputDialog.getText(parent, 'New record!', 'Your name:')
     if ok:
-        model.add(mode, name, seconds)
+        model.add(mode, name, seconds, parent.playground.bbbv)
         show(parent)
 
 
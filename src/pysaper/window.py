@@ -119,6 +119,10 @@ class MainWindow(QMainWindow):
 
     def new_game(self) -> None:
         """Set up for a new game"""
+        self.play(game.Board(self.rows, self.cols, self.bombcount, question=self.property('question')))
+
+    def play(self, board) -> None:
+        """Reset timer and counters, and put given board in the window"""
         self.new.setIcon(self.smiley)
         #be sure that timer is reset and shows 0
         if self.timerID :
@@ -130,7 +134,7 @@ class MainWindow(QMainWindow):
         self.bombsleft = self.bombcount
         self.statusbar.showMessage(f'{self.bombsleft} bombs left')
         #game widget
-        self.playground = game.Board(self.rows, self.cols, self.bombcount, question=self.property('question'))
+        self.playground = board
         self.playground.lost.connect(self.handle_failure)
         self.playground.won.connect(self.handle_victory)
         for field in self.playground.fields :
@@ -153,8 +157,9 @@ class MainWindow(QMainWindow):
         self.timerID = 0
         self.statusbar.showMessage('Victory!')
         self.new.setIcon(self.glasses)
-        #saving best time
-        records.end_game(self)
+        #saving best time, unless the game was played by a bot
+        if not self.playground.property('bot'):
+            records.end_game(self)
 
     def handle_mouse_press(self, field) -> None:
         """Change icon to wow and press buttons"""